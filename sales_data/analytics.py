@@ -8,7 +8,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta, date
 import calendar
-import database as db
+import exports
+import loaders
 import numpy as np
 from scipy import stats
 
@@ -63,81 +64,218 @@ if 'date_range' not in st.session_state:
 if 'selected_product' not in st.session_state:
     st.session_state.selected_product = "All"
 
+def _fast_period_agg(df, period, period_col):
+    """
+    Sum sales, profit and quantity and count transactions per period key
+    Sorts the integer-backed keys once and reduces each contiguous run with
+    np.add.reduceat, avoiding the hash table built by groupby
+    """
+    order = np.argsort(period, kind='stable')
+    keys = period[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return pd.DataFrame({
+        period_col: keys[starts],
+        'sales': np.add.reduceat(df['sales'].to_numpy()[order], starts, dtype=np.float64),
+        'profit': np.add.reduceat(df['profit'].to_numpy()[order], starts, dtype=np.float64),
+        'quantity': np.add.reduceat(df['quantity'].to_numpy()[order], starts, dtype=np.int64),
+        'transactions': np.diff(np.append(starts, len(keys)))
+    })
+
+@st.cache_data(show_spinner=False)
+def _fig_sales_trend(trend_data, period_col, time_period):
+    """Build the sales trend chart, cached per aggregated trend data"""
+    fig = px.line(
+        trend_data,
+        x=period_col,
+        y='sales',
+        markers=True,
+        line_shape='spline',
+        title=f"{time_period} Sales Trend"
+    )
+    fig.update_layout(
+        xaxis_title=time_period,
+        yaxis_title="Sales (₹)",
+        hovermode='x unified'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _fig_profit_margin_trend(trend_data, period_col, time_period):
+    """Build the profit margin trend chart, cached per aggregated trend data"""
+    fig = px.bar(
+        trend_data,
+        x=period_col,
+        y='profit_margin',
+        title=f"{time_period} Profit Margin (%)"
+    )
+    fig.update_layout(
+        xaxis_title=time_period,
+        yaxis_title="Profit Margin %",
+        yaxis_tickformat=".1f%"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _fig_top_products(product_sales):
+    """Build the top products chart, cached per aggregated product data"""
+    fig = px.bar(
+        product_sales,
+        x='sales',
+        y='product',
+        orientation='h',
+        color='profit_margin',
+        color_continuous_scale='Viridis',
+        title="Top Products Performance"
+    )
+    fig.update_layout(
+        xaxis_title="Sales (₹)",
+        yaxis_title="Product",
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _fig_top_customers(customer_sales):
+    """Build the customer value chart, cached per aggregated customer data"""
+    fig = px.scatter(
+        customer_sales,
+        x='transactions',
+        y='sales',
+        size='profit',
+        color='profit',
+        hover_name='customer',
+        size_max=60,
+        title="Customer Value Analysis"
+    )
+    fig.update_layout(
+        xaxis_title="Number of Transactions",
+        yaxis_title="Total Sales (₹)"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _fig_profitability_matrix(profit_analysis):
+    """Build the product profitability matrix, cached per aggregated product data"""
+    fig = px.scatter(
+        profit_analysis,
+        x='sales',
+        y='profit_margin',
+        size='quantity',
+        color='profit',
+        hover_name='product',
+        title="Product Profitability Matrix",
+        labels={
+            'sales': 'Total Sales (₹)',
+            'profit_margin': 'Profit Margin (%)',
+            'quantity': 'Units Sold',
+            'profit': 'Total Profit (₹)'
+        }
+    )
+    
+    fig.update_layout(
+        xaxis_title="Total Sales (₹)",
+        yaxis_title="Profit Margin (%)",
+        hovermode='closest'
+    )
+    
+    # Add quadrant lines
+    median_sales = profit_analysis['sales'].median()
+    median_margin = profit_analysis['profit_margin'].median()
+    
+    fig.add_hline(
+        y=median_margin,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text=f"Median Margin: {median_margin:.1f}%"
+    )
+    
+    fig.add_vline(
+        x=median_sales,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text=f"Median Sales: ₹{median_sales:,.0f}"
+    )
+    return fig
+
 # Main title
 st.markdown("<h1 style='text-align: center; color: #1E3A8A;'>📊 Sales Analytics Dashboard</h1>", 
             unsafe_allow_html=True)
 
+# Load data for filters before building any widgets and stop early if empty
+filter_metadata = loaders.load_filter_metadata()
+
+if filter_metadata['min_date'] is None:
+    st.sidebar.warning("No data available. Please add sales data first.")
+    st.warning("""
+    ⚠️ **No sales data available for analysis**
+    
+    Please visit the **Data Entry** page to add sales records first.
+    """)
+    st.stop()
+
 # ===============================
 # SIDEBAR - FILTERS AND CONTROLS
 # ===============================
 with st.sidebar:
     st.header("🎛️ Dashboard Controls")
     
-    # Load data for filters
-    df_all = db.get_all_sales()
+    # Date range selector
+    min_date = filter_metadata['min_date']
+    max_date = filter_metadata['max_date']
     
-    if not df_all.empty:
-        # Date range selector
-        df_all['order_date'] = pd.to_datetime(df_all['order_date'])
-        min_date = df_all['order_date'].min().date()
-        max_date = df_all['order_date'].max().date()
-        
-        date_range = st.date_input(
-            "📅 Select Date Range",
-            value=(min_date, max_date),
-            min_value=min_date,
-            max_value=max_date
-        )
-        
-        # Product filter
-        products = ["All"] + sorted(df_all['product'].unique().tolist())
-        selected_product = st.selectbox(
-            "📦 Filter by Product",
-            products,
-            index=0
-        )
-        
-        # Time period selector
-        time_period = st.selectbox(
-            "⏰ Analysis Period",
-            ["Daily", "Weekly", "Monthly", "Quarterly", "Yearly"],
-            index=2
-        )
-        
-        # Additional filters
-        st.subheader("🎯 Advanced Filters")
-        
-        min_sales = st.number_input(
-            "Minimum Sales Amount",
-            min_value=0.0,
-            value=0.0,
-            step=100.0
-        )
-        
-        min_profit = st.number_input(
-            "Minimum Profit",
-            min_value=0.0,
-            value=0.0,
-            step=100.0
-        )
-        
-        # Update session state
-        st.session_state.date_range = date_range
-        st.session_state.selected_product = selected_product
-        
-        st.divider()
-        
-        # Quick actions
-        st.subheader("⚡ Quick Actions")
-        
-        if st.button("🔄 Refresh Dashboard", use_container_width=True):
-            st.rerun()
-        
-        if st.button("📥 Export Dashboard Data", use_container_width=True):
-            st.info("Export functionality would be implemented here")
+    date_range = st.date_input(
+        "📅 Select Date Range",
+        value=(min_date, max_date),
+        min_value=min_date,
+        max_value=max_date
+    )
+    
+    # Product filter
+    selected_product = st.selectbox(
+        "📦 Filter by Product",
+        ["All", *filter_metadata['products']],
+        index=0
+    )
+    
+    # Time period selector
+    time_period = st.selectbox(
+        "⏰ Analysis Period",
+        ["Daily", "Weekly", "Monthly", "Quarterly", "Yearly"],
+        index=2
+    )
+    
+    # Additional filters
+    st.subheader("🎯 Advanced Filters")
+    
+    min_sales = st.number_input(
+        "Minimum Sales Amount",
+        min_value=0.0,
+        value=0.0,
+        step=100.0
+    )
+    
+    min_profit = st.number_input(
+        "Minimum Profit",
+        min_value=0.0,
+        value=0.0,
+        step=100.0
+    )
+    
+    # Update session state
+    st.session_state.date_range = date_range
+    st.session_state.selected_product = selected_product
+    
+    st.divider()
+    
+    # Quick actions
+    st.subheader("⚡ Quick Actions")
+    
+    if st.button("🔄 Refresh Dashboard", use_container_width=True):
+        loaders.clear_caches()
+        st.rerun()
     
-    else:
-        st.warning("No data available. Please add sales data first.")
+    if st.button("📥 Export Dashboard Data", use_container_width=True):
+        st.info("Export functionality would be implemented here")
     
     st.divider()
     st.caption("Dashboard Last Updated:")
@@ -146,29 +284,19 @@ with st.sidebar:
 # ===============================
 # MAIN CONTENT AREA
 # ===============================
-if df_all.empty:
-    st.warning("""
-    ⚠️ **No sales data available for analysis**
-    
-    Please visit the **Data Entry** page to add sales records first.
-    """)
-    st.stop()
-
-# Apply filters
-df = df_all.copy()
-df['order_date'] = pd.to_datetime(df['order_date'])
-
+# Apply filters in the database query
 if len(st.session_state.date_range) == 2:
     start_date, end_date = st.session_state.date_range
-    mask = (df['order_date'].dt.date >= start_date) & (df['order_date'].dt.date <= end_date)
-    df = df[mask]
-
-if st.session_state.selected_product != "All":
-    df = df[df['product'] == st.session_state.selected_product]
-
-# Apply advanced filters
-df = df[df['sales'] >= min_sales]
-df = df[df['profit'] >= min_profit]
+else:
+    start_date, end_date = min_date, max_date
+
+df = loaders.load_filtered_sales(
+    start_date,
+    end_date,
+    None if st.session_state.selected_product == "All" else st.session_state.selected_product,
+    min_sales,
+    min_profit
+)
 
 if df.empty:
     st.warning("No data matches the selected filters. Please adjust your filter criteria.")
@@ -179,9 +307,8 @@ if df.empty:
 # ===============================
 st.subheader("📈 Key Performance Indicators")
 
-# Calculate KPIs
-total_sales = df['sales'].sum()
-total_profit = df['profit'].sum()
+# Calculate KPIs (sales and profit summed in a single reduction)
+total_sales, total_profit = df[['sales', 'profit']].to_numpy().sum(axis=0, dtype=np.float64)
 total_orders = len(df)
 avg_order_value = total_sales / total_orders if total_orders > 0 else 0
 profit_margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
@@ -233,40 +360,33 @@ st.divider()
 # ===============================
 st.subheader("📊 Sales Trend Analysis")
 
-# Prepare data for time series
-df['year_month'] = df['order_date'].dt.strftime('%Y-%m')
-df['year'] = df['order_date'].dt.year
-df['month'] = df['order_date'].dt.month
-df['week'] = df['order_date'].dt.isocalendar().week
-df['quarter'] = df['order_date'].dt.quarter
-
-# Group by selected time period
+# Derive an integer-backed key for the selected time period only
+order_dates = df['order_date'].to_numpy()
 if time_period == "Daily":
     period_col = 'order_date'
-    group_format = '%Y-%m-%d'
+    period = order_dates.astype('datetime64[D]')
 elif time_period == "Weekly":
     period_col = 'week'
-    group_format = None
+    period = df['order_date'].dt.isocalendar().week.to_numpy(dtype='int64')
 elif time_period == "Monthly":
     period_col = 'year_month'
-    group_format = None
+    period = order_dates.astype('datetime64[M]')
 elif time_period == "Quarterly":
     period_col = 'quarter'
-    group_format = None
+    # Months since 1970-01 divided by 3 gives a quarter ordinal
+    period = order_dates.astype('datetime64[M]').astype('int64') // 3
 else:  # Yearly
     period_col = 'year'
-    group_format = None
+    period = df['order_date'].dt.year.to_numpy()
 
-if group_format:
-    df[period_col] = df['order_date'].dt.strftime(group_format)
+trend_data = _fast_period_agg(df, period, period_col)
 
-trend_data = df.groupby(period_col).agg({
-    'sales': 'sum',
-    'profit': 'sum',
-    'quantity': 'sum',
-    'id': 'count'
-}).reset_index()
-trend_data.rename(columns={'id': 'transactions'}, inplace=True)
+# Format period labels on the aggregated rows rather than on every record
+if time_period == "Monthly":
+    trend_data[period_col] = trend_data[period_col].dt.strftime('%Y-%m')
+elif time_period == "Quarterly":
+    quarters = trend_data[period_col]
+    trend_data[period_col] = (1970 + quarters // 4).astype(str) + 'Q' + (quarters % 4 + 1).astype(str)
 
 # Create two columns for charts
 col1, col2 = st.columns(2)
@@ -275,40 +395,22 @@ with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown("**Sales Trend Over Time**")
     
-    fig1 = px.line(
-        trend_data,
-        x=period_col,
-        y='sales',
-        markers=True,
-        line_shape='spline',
-        title=f"{time_period} Sales Trend"
-    )
-    fig1.update_layout(
-        xaxis_title=time_period,
-        yaxis_title="Sales (₹)",
-        hovermode='x unified'
+    st.plotly_chart(
+        _fig_sales_trend(trend_data, period_col, time_period),
+        use_container_width=True
     )
-    st.plotly_chart(fig1, use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown("**Profit Margin Trend**")
     
-    trend_data['profit_margin'] = (trend_data['profit'] / trend_data['sales'] * 100)
+    trend_data = trend_data.eval('profit_margin = profit / sales * 100')
     
-    fig2 = px.bar(
-        trend_data,
-        x=period_col,
-        y='profit_margin',
-        title=f"{time_period} Profit Margin (%)"
-    )
-    fig2.update_layout(
-        xaxis_title=time_period,
-        yaxis_title="Profit Margin %",
-        yaxis_tickformat=".1f%"
+    st.plotly_chart(
+        _fig_profit_margin_trend(trend_data, period_col, time_period),
+        use_container_width=True
     )
-    st.plotly_chart(fig2, use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # ===============================
@@ -316,63 +418,37 @@ with col2:
 # ===============================
 st.subheader("👥 Product & Customer Insights")
 
+# Aggregate by product once; shared by the top products chart and profitability matrix
+by_product = df.groupby('product', as_index=False, observed=True).agg({
+    'sales': 'sum',
+    'profit': 'sum',
+    'quantity': 'sum'
+})
+by_product = by_product.eval('profit_margin = profit / sales * 100')
+
 col1, col2 = st.columns(2)
 
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown("**Top 10 Products by Sales**")
     
-    product_sales = df.groupby('product').agg({
-        'sales': 'sum',
-        'profit': 'sum',
-        'quantity': 'sum'
-    }).nlargest(10, 'sales').reset_index()
-    
-    product_sales['profit_margin'] = (product_sales['profit'] / product_sales['sales'] * 100)
+    product_sales = by_product.nlargest(10, 'sales')
     
-    fig3 = px.bar(
-        product_sales,
-        x='sales',
-        y='product',
-        orientation='h',
-        color='profit_margin',
-        color_continuous_scale='Viridis',
-        title="Top Products Performance"
-    )
-    fig3.update_layout(
-        xaxis_title="Sales (₹)",
-        yaxis_title="Product",
-        yaxis={'categoryorder': 'total ascending'}
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+    st.plotly_chart(_fig_top_products(product_sales), use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown("**Top 10 Customers**")
     
-    customer_sales = df.groupby('customer').agg({
+    customer_sales = df.groupby('customer', as_index=False, observed=True).agg({
         'sales': 'sum',
         'profit': 'sum',
         'id': 'count'
-    }).nlargest(10, 'sales').reset_index()
+    }).nlargest(10, 'sales')
     customer_sales.rename(columns={'id': 'transactions'}, inplace=True)
     
-    fig4 = px.scatter(
-        customer_sales,
-        x='transactions',
-        y='sales',
-        size='profit',
-        color='profit',
-        hover_name='customer',
-        size_max=60,
-        title="Customer Value Analysis"
-    )
-    fig4.update_layout(
-        xaxis_title="Number of Transactions",
-        yaxis_title="Total Sales (₹)"
-    )
-    st.plotly_chart(fig4, use_container_width=True)
+    st.plotly_chart(_fig_top_customers(customer_sales), use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # ===============================
@@ -381,58 +457,13 @@ with col2:
 st.subheader("💰 Profitability Analysis")
 
 # Calculate profitability metrics
-profit_analysis = df.groupby('product').agg({
-    'sales': 'sum',
-    'profit': 'sum',
-    'quantity': 'sum'
-}).reset_index()
-
-profit_analysis['profit_margin'] = (profit_analysis['profit'] / profit_analysis['sales'] * 100)
-profit_analysis['avg_price'] = profit_analysis['sales'] / profit_analysis['quantity']
-profit_analysis['profit_per_unit'] = profit_analysis['profit'] / profit_analysis['quantity']
-
-# Create scatter plot for profitability vs sales
-fig5 = px.scatter(
-    profit_analysis,
-    x='sales',
-    y='profit_margin',
-    size='quantity',
-    color='profit',
-    hover_name='product',
-    title="Product Profitability Matrix",
-    labels={
-        'sales': 'Total Sales (₹)',
-        'profit_margin': 'Profit Margin (%)',
-        'quantity': 'Units Sold',
-        'profit': 'Total Profit (₹)'
-    }
-)
-
-fig5.update_layout(
-    xaxis_title="Total Sales (₹)",
-    yaxis_title="Profit Margin (%)",
-    hovermode='closest'
-)
-
-# Add quadrant lines
-median_sales = profit_analysis['sales'].median()
-median_margin = profit_analysis['profit_margin'].median()
-
-fig5.add_hline(
-    y=median_margin,
-    line_dash="dash",
-    line_color="gray",
-    annotation_text=f"Median Margin: {median_margin:.1f}%"
+profit_analysis = by_product.eval(
+    'avg_price = sales / quantity\n'
+    'profit_per_unit = profit / quantity'
 )
 
-fig5.add_vline(
-    x=median_sales,
-    line_dash="dash",
-    line_color="gray",
-    annotation_text=f"Median Sales: ₹{median_sales:,.0f}"
-)
-
-st.plotly_chart(fig5, use_container_width=True)
+# Scatter plot of profitability vs sales with median quadrant lines
+st.plotly_chart(_fig_profitability_matrix(profit_analysis), use_container_width=True)
 
 # ===============================
 # ROW 5: DATA TABLE AND EXPORT
@@ -441,16 +472,18 @@ st.subheader("📋 Detailed Data View")
 
 # Show filtered data
 with st.expander("View Filtered Data Table", expanded=False):
-    display_df = df.copy()
-    display_df['order_date'] = display_df['order_date'].dt.strftime('%Y-%m-%d')
-    display_df = display_df.sort_values('order_date', ascending=False)
+    # Sort on the datetime64 column; dates are formatted client-side by column_config
+    display_df = df.sort_values('order_date', ascending=False)
     
     st.dataframe(
         display_df,
         use_container_width=True,
         column_config={
             "id": "ID",
-            "order_date": "Date",
+            "order_date": st.column_config.DateColumn(
+                "Date",
+                format="YYYY-MM-DD"
+            ),
             "product": "Product",
             "customer": "Customer",
             "quantity": "Qty",
@@ -470,25 +503,18 @@ with st.expander("View Filtered Data Table", expanded=False):
     col1, col2 = st.columns(2)
     
     with col1:
-        csv = display_df.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="📥 Download as CSV",
-            data=csv,
+            data=exports.to_csv(display_df),
             file_name=f"filtered_sales_data_{date.today()}.csv",
             mime="text/csv",
             use_container_width=True
         )
     
     with col2:
-        # Simple Excel export using to_excel
-        import io
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            display_df.to_excel(writer, index=False, sheet_name='Sales Data')
-        
         st.download_button(
             label="📊 Download as Excel",
-            data=buffer.getvalue(),
+            data=exports.to_excel(display_df),
             file_name=f"filtered_sales_data_{date.today()}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True
@@ -510,7 +536,7 @@ with col1:
 with col2:
     st.metric(
         "📦 Products Analyzed",
-        f"{len(df['product'].unique())} of {len(df_all['product'].unique())}"
+        f"{len(df['product'].cat.categories)} of {len(filter_metadata['products'])}"
     )
 
 with col3:
@@ -4,8 +4,11 @@ Handles adding, viewing, and managing sales records
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import date, datetime
 import database as db
+import exports
+import loaders
 
 # Page configuration
 st.set_page_config(
@@ -68,16 +71,17 @@ if 'delete_record_id' not in st.session_state:
 # Main title
 st.markdown('<h1 class="main-header">🧾 Sales Data Entry System</h1>', unsafe_allow_html=True)
 
+# Load current data once, before the sidebar, from the shared cache
+df_all = loaders.load_sales()
+df_view = df_all
+
 # Sidebar for additional features
 with st.sidebar:
     st.header("📊 Quick Stats")
     
-    # Load current data for stats
-    df_all = db.get_all_sales()
-    
     if not df_all.empty:
-        total_sales = df_all['sales'].sum()
-        total_profit = df_all['profit'].sum()
+        # Sum sales and profit together in a single reduction over both columns
+        total_sales, total_profit = df_all[['sales', 'profit']].to_numpy().sum(axis=0, dtype=np.float64)
         total_records = len(df_all)
         
         st.metric("Total Records", f"{total_records:,}")
@@ -90,21 +94,23 @@ with st.sidebar:
         st.divider()
         st.subheader("📅 Filter Data")
         
-        if 'df' in locals() and not df_all.empty:
-            min_date = pd.to_datetime(df_all['order_date']).min().date()
-            max_date = pd.to_datetime(df_all['order_date']).max().date()
-            
-            date_filter = st.date_input(
-                "Filter by Date",
-                value=(min_date, max_date),
-                min_value=min_date,
-                max_value=max_date
-            )
-            
-            if len(date_filter) == 2:
-                mask = (pd.to_datetime(df_all['order_date']).dt.date >= date_filter[0]) & \
-                       (pd.to_datetime(df_all['order_date']).dt.date <= date_filter[1])
-                df_all = df_all[mask]
+        # order_date is already parsed to datetime64 by get_all_sales()
+        dates = df_all['order_date']
+        min_date = dates.min().date()
+        max_date = dates.max().date()
+        
+        date_filter = st.date_input(
+            "Filter by Date",
+            value=(min_date, max_date),
+            min_value=min_date,
+            max_value=max_date
+        )
+        
+        if len(date_filter) == 2:
+            start_ts = pd.Timestamp(date_filter[0])
+            end_ts = pd.Timestamp(date_filter[1]) + pd.Timedelta(days=1)
+            mask = (dates >= start_ts) & (dates < end_ts)
+            df_view = df_all.loc[mask]
     
     st.divider()
     st.markdown("---")
@@ -191,6 +197,7 @@ if submit_button:
         success, message = db.add_sale_record(order_date, product, customer, sales, profit, quantity)
         
         if success:
+            loaders.clear_caches()
             st.markdown(f'<div class="success-box">✅ {message}</div>', unsafe_allow_html=True)
             st.session_state.last_submission = datetime.now()
             
@@ -219,45 +226,53 @@ st.markdown('<h2 class="sub-header">📋 Sales Records Management</h2>', unsafe_
 col_refresh, col_stats = st.columns([1, 3])
 with col_refresh:
     if st.button("🔄 Refresh Data", key="refresh_main"):
+        loaders.clear_caches()
         st.session_state.refresh_data = True
         st.rerun()
 
-# Load data
-df = db.get_all_sales()
+# The records table, delete and export work on the sidebar's date range
+df = df_view
 
-if df.empty:
+if df_all.empty:
     st.markdown('<div class="info-box">ℹ️ No sales records found. Add your first sale above!</div>', 
                unsafe_allow_html=True)
+elif df.empty:
+    st.markdown('<div class="info-box">ℹ️ No sales records in the selected date range.</div>', 
+               unsafe_allow_html=True)
 else:
     # Display summary
     with col_stats:
         st.info(f"📊 Showing {len(df):,} sales records")
     
-    # Convert date column for better display
-    df_display = df.copy()
-    df_display['order_date'] = pd.to_datetime(df_display['order_date']).dt.strftime('%Y-%m-%d')
-    df_display['created_at'] = pd.to_datetime(df_display['created_at']).dt.strftime('%Y-%m-%d %H:%M')
-    
-    # Format currency columns
-    df_display['sales'] = df_display['sales'].apply(lambda x: f"₹{x:,.2f}")
-    df_display['profit'] = df_display['profit'].apply(lambda x: f"₹{x:,.2f}")
-    
-    # Display data with container for better scrolling
+    # Display data with container for better scrolling; dates and
+    # currency are formatted client-side by column_config
     with st.container():
         st.dataframe(
-            df_display,
+            df,
             use_container_width=True,
             hide_index=True,
             column_order=["id", "order_date", "product", "customer", "quantity", "sales", "profit", "created_at"],
             column_config={
                 "id": "ID",
-                "order_date": "Order Date",
+                "order_date": st.column_config.DateColumn(
+                    "Order Date",
+                    format="YYYY-MM-DD"
+                ),
                 "product": "Product",
                 "customer": "Customer",
                 "quantity": "Qty",
-                "sales": "Sales (₹)",
-                "profit": "Profit (₹)",
-                "created_at": "Added On"
+                "sales": st.column_config.NumberColumn(
+                    "Sales (₹)",
+                    format="₹%.2f"
+                ),
+                "profit": st.column_config.NumberColumn(
+                    "Profit (₹)",
+                    format="₹%.2f"
+                ),
+                "created_at": st.column_config.DatetimeColumn(
+                    "Added On",
+                    format="YYYY-MM-DD HH:mm"
+                )
             }
         )
     
@@ -272,7 +287,7 @@ else:
         record_id = st.number_input(
             "Enter Record ID to delete",
             min_value=1,
-            max_value=int(df['id'].max()) if not df.empty else 1,
+            max_value=int(df_all['id'].max()) if not df_all.empty else 1,
             step=1,
             help="Enter the ID of the record you want to delete"
         )
@@ -289,6 +304,7 @@ else:
                         if st.button("Yes, Delete It", type="primary"):
                             success = db.delete_sale_record(record_id)
                             if success:
+                                loaders.clear_caches()
                                 st.success(f"✅ Record #{record_id} deleted successfully!")
                                 st.session_state.delete_record_id = record_id
                                 st.rerun()
@@ -310,10 +326,9 @@ if not df.empty:
     
     # CSV Export
     with col_csv:
-        csv_data = df.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="📄 Download as CSV",
-            data=csv_data,
+            data=exports.to_csv(df),
             file_name=f"sales_data_{date.today()}.csv",
             mime="text/csv",
             use_container_width=True
@@ -321,22 +336,9 @@ if not df.empty:
     
     # Excel Export
     with col_excel:
-        # For Excel export, we need to use a different approach
-        @st.cache_data
-        def convert_df_to_excel(df):
-            from io import BytesIO
-            import xlsxwriter
-            
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, index=False, sheet_name='Sales Data')
-                writer.save()
-            return output.getvalue()
-        
-        excel_data = convert_df_to_excel(df)
         st.download_button(
             label="📊 Download as Excel",
-            data=excel_data,
+            data=exports.to_excel(df),
             file_name=f"sales_data_{date.today()}.xlsx",
             mime="application/vnd.ms-excel",
             use_container_width=True
@@ -3,158 +3,783 @@ Database module for Sales Analytics System
 Centralized database operations to prevent duplication and ensure consistency
 """
 import sqlite3
+import logging
+import time
 import pandas as pd
+import numpy as np
 import os
+import queue
+import threading
+import atexit
+from collections import OrderedDict
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import date, datetime
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc
+except ImportError:
+    adbc = None
+
+# Errors that can carry SQLITE_BUSY/SQLITE_LOCKED from either driver
+_BUSY_ERRORS = (sqlite3.OperationalError,) if adbc is None else (sqlite3.OperationalError, adbc.DatabaseError)
+
+logger = logging.getLogger(__name__)
+
+# Bind dates as YYYY-MM-DD text using the C-level isoformat rather than
+# strftime; datetimes bound as order dates keep only their date part
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda d: d.date().isoformat())
+sqlite3.register_adapter(pd.Timestamp, lambda d: d.date().isoformat())
 
 # Database configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "sales_data.db")
 
+# Stored in PRAGMA user_version; version 1 keeps sales and profit as INTEGER cents
+SCHEMA_VERSION = 1
+
+# Per-connection tuning; these settings do not persist in the database file
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Batches at least this long are validated with pandas instead of row by row
+VECTORIZE_MIN_ROWS = 1000
+
+# Compiled statements kept per pooled connection by sqlite3's LRU cache
+STATEMENT_CACHE_SIZE = 256
+
+# Fixed INSERT text, so every call hits the statement cache
+_INSERT_SQL = (
+    "INSERT INTO sales (order_date, product, customer, sales, profit, quantity) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# SQLite 3.35+ can hand back the new id from the INSERT step itself
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_INSERT_RETURNING_SQL = _INSERT_SQL + " RETURNING id"
+
+# Rows fetched per round-trip when building DataFrames
+READ_CHUNK_SIZE = 10_000
+
+# Fetch query results straight into Arrow buffers when adbc-driver-sqlite is
+# installed; set SALES_ARROW_FETCH=0 to force the sqlite3 path
+ARROW_FETCH = adbc is not None and os.environ.get("SALES_ARROW_FETCH", "1") != "0"
+
+# Memoized get_sales_summary results, keyed by (start_date, end_date, _CACHE_VERSION)
+SUMMARY_CACHE_SIZE = 32
+_SUMMARY_CACHE = OrderedDict()
+_CACHE_VERSION = 0
+
+# (_CACHE_VERSION, all-time summary indexed by order_date newest first); date
+# range summaries are sliced from it instead of re-running the GROUP BY
+_DAILY_SUMMARY = None
+_cache_lock = threading.Lock()
+
+# get_sales_summary statements, with and without a date range; ordering on every
+# group key lets SQLite walk idx_sales_group backwards instead of sorting the
+# grouped rows in a temp B-tree
+_SUMMARY_SELECT = """
+    SELECT 
+        order_date,
+        product,
+        customer,
+        SUM(sales) / 100.0 as total_sales,
+        SUM(profit) / 100.0 as total_profit,
+        SUM(quantity) as total_quantity,
+        COUNT(*) as transaction_count
+    FROM sales
+"""
+_SUMMARY_GROUP = """
+    GROUP BY order_date, product, customer
+    ORDER BY order_date DESC, product DESC, customer DESC
+"""
+_SUMMARY_SQL_ALL = _SUMMARY_SELECT + _SUMMARY_GROUP
+_SUMMARY_SQL_RANGE = _SUMMARY_SELECT + "    WHERE order_date BETWEEN ? AND ?" + _SUMMARY_GROUP
+
+# Columns update_sale_record may change, and its generated SQL per column set
+UPDATABLE_COLUMNS = frozenset({"order_date", "product", "customer", "sales", "profit", "quantity"})
+_UPDATE_SQL_CACHE = {}
+
+# Retries for statements that fail because another connection holds the lock;
+# the wait doubles from BUSY_BACKOFF seconds on each attempt
+BUSY_RETRIES = 5
+BUSY_BACKOFF = 0.01
+
+# Seconds SQLite's own busy handler waits for a lock before an attempt fails;
+# kept short so _retry_busy does the waiting instead of sqlite3's 5 s default
+BUSY_TIMEOUT = 0.1
+
+# Connection pool configuration; Arrow reads use a second pool of autocommit
+# ADBC connections so they never sit inside a sqlite3 transaction
+POOL_SIZE = 4
+_pool = queue.Queue(maxsize=POOL_SIZE)
+_pool_connections = []
+_arrow_pool = queue.Queue(maxsize=POOL_SIZE)
+_arrow_connections = []
+_pool_lock = threading.Lock()
+
+# Schema is created lazily on first use rather than at import time
+_INITIALIZED = False
+_init_lock = threading.Lock()
+
+def _retry_busy(operation, *args):
+    """
+    Call operation(*args), retrying with exponential backoff while SQLite
+    reports the database as busy or locked
+    """
+    for attempt in range(BUSY_RETRIES):
+        try:
+            return operation(*args)
+        except _BUSY_ERRORS as e:
+            message = str(e)
+            if attempt == BUSY_RETRIES - 1 or not ("locked" in message or "busy" in message):
+                raise
+            logger.warning("Database busy, retrying (attempt %d): %s", attempt + 1, e)
+            time.sleep(BUSY_BACKOFF * 2 ** attempt)
+
+def _open_connection():
+    """Open a long-lived connection with WAL and per-connection PRAGMAs applied"""
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=BUSY_TIMEOUT,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    # WAL and memory-mapped I/O only apply to file-backed databases; WAL is
+    # persisted in the file and must be set outside a transaction
+    if DB_PATH != ":memory:":
+        _retry_busy(conn.execute, "PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        # Checkpoint every ~40 MB of WAL instead of every 1000 pages so writers
+        # stall less often; checkpoint() can truncate the WAL in between
+        conn.execute("PRAGMA wal_autocheckpoint=10000")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _open_arrow_connection():
+    """
+    Open a long-lived ADBC connection with the same PRAGMAs as the sqlite3
+    pool; autocommit keeps it from pinning an old snapshot between reads
+    """
+    conn = adbc.connect(DB_PATH, autocommit=True)
+    with conn.cursor() as cursor:
+        # ADBC does not wait for locks by default; match the sqlite3 pool
+        busy_timeout = f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}"
+        for pragma in (busy_timeout, "PRAGMA mmap_size=268435456", *CONNECTION_PRAGMAS):
+            cursor.execute(pragma)
+    return conn
+
+def _checkout(pool, connections, open_connection):
+    """Take an idle connection from pool, opening a new one while below POOL_SIZE"""
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        pass
+    with _pool_lock:
+        if len(connections) < POOL_SIZE:
+            conn = open_connection()
+            connections.append(conn)
+            return conn
+    return pool.get()
+
+def _checkout_connection():
+    """Take an idle pooled sqlite3 connection"""
+    return _checkout(_pool, _pool_connections, _open_connection)
+
+def _checkout_arrow_connection():
+    """Take an idle pooled ADBC connection"""
+    return _checkout(_arrow_pool, _arrow_connections, _open_arrow_connection)
+
+@atexit.register
+def close_all_connections():
+    """
+    Close every idle pooled connection, refreshing planner statistics first;
+    connections still checked out by another thread are left open
+    """
+    with _pool_lock:
+        while True:
+            try:
+                conn = _pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                logger.warning("PRAGMA optimize failed", exc_info=True)
+            conn.close()
+            _pool_connections.remove(conn)
+        while True:
+            try:
+                conn = _arrow_pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            _arrow_connections.remove(conn)
+
+def _reset_pool_after_fork():
+    """Drop connections inherited from the parent; SQLite handles must not cross fork()"""
+    global _pool, _pool_connections, _arrow_pool, _arrow_connections, _pool_lock, _init_lock
+    _pool = queue.Queue(maxsize=POOL_SIZE)
+    _pool_connections = []
+    _arrow_pool = queue.Queue(maxsize=POOL_SIZE)
+    _arrow_connections = []
+    _pool_lock = threading.Lock()
+    # A lock held by another thread at fork time would never be released in the child
+    _init_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
 @contextmanager
-def get_connection():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_PATH)
+def _pooled_transaction(immediate=False):
+    """Check out a pooled connection and wrap its use in a transaction"""
+    conn = _checkout_connection()
     try:
+        _retry_busy(conn.execute, "BEGIN IMMEDIATE" if immediate else "BEGIN")
         yield conn
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
     finally:
-        conn.close()
+        _pool.put(conn)
+
+def checkpoint():
+    """
+    Copy the WAL back into the database file and truncate it; meant to be run
+    periodically, e.g. from a scheduled job
+    Returns: (busy, wal_pages, checkpointed_pages), or None on error
+    """
+    try:
+        ensure_initialized()
+        # Runs outside a transaction; an open read would keep the WAL in use
+        conn = _checkout_connection()
+        try:
+            return _retry_busy(conn.execute, "PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        finally:
+            _pool.put(conn)
+    except Exception:
+        logger.exception("Error checkpointing database")
+        return None
+
+def ensure_initialized():
+    """Create the schema once per process; cheap to call repeatedly"""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    with _init_lock:
+        if not _INITIALIZED:
+            init_database()
+            _INITIALIZED = True
+
+@contextmanager
+def get_connection(immediate=False):
+    """
+    Context manager that checks out a pooled connection inside a transaction
+    immediate=True takes the write lock up front (BEGIN IMMEDIATE)
+    """
+    ensure_initialized()
+    with _pooled_transaction(immediate) as conn:
+        yield conn
+
+def _create_sales_table(conn):
+    """Create the sales table; sales and profit are whole cents"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_date TEXT NOT NULL,
+            product TEXT NOT NULL,
+            customer TEXT NOT NULL,
+            sales INTEGER NOT NULL,
+            profit INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT chk_profit CHECK (profit <= sales)
+        )
+    """)
+
+def _migrate_to_cents(conn):
+    """Rebuild a version 0 sales table (DECIMAL rupees) with INTEGER cents"""
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sales'").fetchone()
+    conn.execute("ALTER TABLE sales RENAME TO sales_v0")
+    _create_sales_table(conn)
+    conn.execute("""
+        INSERT INTO sales (id, order_date, product, customer, sales, profit, quantity, created_at)
+        SELECT id, order_date, product, customer,
+               CAST(ROUND(sales * 100) AS INTEGER),
+               CAST(ROUND(profit * 100) AS INTEGER),
+               quantity, created_at
+        FROM sales_v0
+    """)
+    # Dropping the old table also drops its indexes, so init_database recreates them
+    conn.execute("DROP TABLE sales_v0")
+    
+    # Keep AUTOINCREMENT from reusing ids of records deleted before the migration
+    if seq is not None:
+        cursor = conn.execute(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'sales'", seq
+        )
+        if cursor.rowcount == 0:
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('sales', ?)", seq)
 
 def init_database():
     """Initialize database with proper schema and indexes"""
-    with get_connection() as conn:
+    # Take the write lock up front; upgrading a read transaction fails
+    # immediately with "database is locked" while another writer is active
+    with _pooled_transaction(immediate=True) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sales'"
+        ).fetchone()
+        migrate = has_table and version < 1
+        if migrate:
+            _migrate_to_cents(conn)
+        
         # Create sales table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS sales (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_date DATE NOT NULL,
-                product VARCHAR(100) NOT NULL,
-                customer VARCHAR(100) NOT NULL,
-                sales DECIMAL(10, 2) NOT NULL,
-                profit DECIMAL(10, 2) NOT NULL,
-                quantity INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                CONSTRAINT chk_profit CHECK (profit <= sales)
-            )
-        """)
+        _create_sales_table(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         
         # Create indexes for better performance
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_order_date ON sales(order_date)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_product ON sales(product)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_customer ON sales(customer)")
         
+        # Covering index for the get_sales_summary GROUP BY; it also leads with
+        # order_date, which makes the single-column date index redundant
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sales_group
+            ON sales(order_date, product, customer, sales, profit, quantity)
+        """)
+        conn.execute("DROP INDEX IF EXISTS idx_order_date")
+        
+        # Matches get_all_sales' ORDER BY so pages come from an index walk
+        # instead of a full sort; id breaks ties between same-second inserts
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sales_recent
+            ON sales(order_date DESC, created_at DESC, id DESC)
+        """)
+        
+        # Gather planner statistics the first time, and again after a migration
+        # rebuilt the indexes; they are kept in sqlite_stat1
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).fetchone()
+        if migrate or not has_stats:
+            conn.execute("ANALYZE")
+        
         conn.commit()
 
-def add_sale_record(order_date, product, customer, sales, profit, quantity):
+def _invalidate_caches():
+    """Bump the cache version after a write so memoized summaries are never reused"""
+    global _CACHE_VERSION, _DAILY_SUMMARY
+    with _cache_lock:
+        _CACHE_VERSION += 1
+        _SUMMARY_CACHE.clear()
+        _DAILY_SUMMARY = None
+
+def _coerce_sale_row(order_date, product, customer, sales, profit, quantity):
     """
-    Add a single sale record to the database
+    Validate one sale row and convert it to bind parameters
+    Returns: (params, error) where error is the failing check, or None
+    """
+    product = product.strip() if isinstance(product, str) else ""
+    customer = customer.strip() if isinstance(customer, str) else ""
+    if not product or not customer:
+        return None, "Product and Customer are required"
+    
+    sales, profit = float(sales), float(profit)
+    if profit > sales:
+        return None, "Profit cannot be greater than sales amount"
+    
+    if float(quantity) <= 0:
+        return None, "Quantity must be greater than 0"
+    
+    return (order_date, product, customer, _to_cents(sales), _to_cents(profit), int(quantity)), None
+
+def _strip_names(column):
+    """Strip a column of names; values that are not strings become "" and fail validation"""
+    try:
+        return column.str.strip().fillna("")
+    except AttributeError:
+        # The .str accessor refuses columns that hold no strings at all
+        return pd.Series("", index=column.index)
+
+def _coerce_sale_batch(rows):
+    """
+    Validate a large batch of sale rows and convert them to bind parameters
+    in one vectorized pass, so each value is parsed only once
+    Returns: (params, error) where error is the first failing check, or None
+    """
+    batch = pd.DataFrame(rows, columns=["order_date", "product", "customer", "sales", "profit", "quantity"])
+    product = _strip_names(batch["product"])
+    customer = _strip_names(batch["customer"])
+    sales = batch["sales"].astype(float)
+    profit = batch["profit"].astype(float)
+    quantity = batch["quantity"].astype(float)
+    
+    checks = (
+        (product.eq("") | customer.eq(""), "Product and Customer are required"),
+        (profit > sales, "Profit cannot be greater than sales amount"),
+        (quantity <= 0, "Quantity must be greater than 0"),
+    )
+    for failed, message in checks:
+        if failed.any():
+            if len(batch) == 1:
+                return None, message
+            return None, f"Row {int(failed.to_numpy().argmax()) + 1}: {message}"
+    
+    # Money is stored as whole cents; tolist() hands back native Python
+    # values (and dates), which sqlite3 can bind
+    params = list(zip(
+        batch["order_date"].tolist(),
+        product.tolist(),
+        customer.tolist(),
+        (sales * 100).round().astype("int64").tolist(),
+        (profit * 100).round().astype("int64").tolist(),
+        quantity.astype("int64").tolist()
+    ))
+    return params, None
+
+def _coerce_sale_rows(rows):
+    """
+    Validate sale rows and convert them to bind parameters; building a
+    DataFrame only pays off for large batches, so short lists go row by row
+    Returns: (params, error) where error is the first failing check, or None
+    """
+    if len(rows) >= VECTORIZE_MIN_ROWS:
+        return _coerce_sale_batch(rows)
+    
+    params = []
+    for number, row in enumerate(rows, 1):
+        values, error = _coerce_sale_row(*row)
+        if error:
+            return None, error if len(rows) == 1 else f"Row {number}: {error}"
+        params.append(values)
+    return params, None
+
+def add_sale_records(rows):
+    """
+    Add many sale records in a single transaction
+    rows: iterable of (order_date, product, customer, sales, profit, quantity) tuples
     Returns: (success, message)
     """
     try:
-        # Validate data
-        if not product or not customer:
-            return False, "Product and Customer are required"
+        rows = list(rows)
+        if not rows:
+            return False, "No sale records to add"
         
-        if profit > sales:
-            return False, "Profit cannot be greater than sales amount"
+        # Validate and convert data
+        params, error = _coerce_sale_rows(rows)
+        if error:
+            return False, error
         
-        if quantity <= 0:
-            return False, "Quantity must be greater than 0"
-        
-        with get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO sales (order_date, product, customer, sales, profit, quantity)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                order_date.strftime("%Y-%m-%d") if hasattr(order_date, 'strftime') else order_date,
-                product.strip(),
-                customer.strip(),
-                float(sales),
-                float(profit),
-                int(quantity)
-            ))
+        with get_connection(immediate=True) as conn:
+            if len(params) == 1:
+                if HAS_RETURNING:
+                    new_id = _retry_busy(conn.execute, _INSERT_RETURNING_SQL, params[0]).fetchone()[0]
+                else:
+                    new_id = _retry_busy(conn.execute, _INSERT_SQL, params[0]).lastrowid
+            else:
+                # executemany discards RETURNING rows, and the batch message
+                # does not need the ids
+                _retry_busy(conn.executemany, _INSERT_SQL, params)
             conn.commit()
-            return True, f"Sale record #{cursor.lastrowid} added successfully"
+        _invalidate_caches()
+        
+        if len(params) == 1:
+            return True, f"Sale record #{new_id} added successfully"
+        return True, f"{len(params)} sale records added successfully"
     
     except sqlite3.Error as e:
+        logger.exception("Database error adding sale records")
         return False, f"Database error: {str(e)}"
     except Exception as e:
+        logger.exception("Unexpected error adding sale records")
         return False, f"Unexpected error: {str(e)}"
 
-def get_all_sales():
-    """Retrieve all sales records"""
+def add_sale_record(order_date, product, customer, sales, profit, quantity):
+    """
+    Add a single sale record to the database
+    Returns: (success, message)
+    """
+    return add_sale_records([(order_date, product, customer, sales, profit, quantity)])
+
+def _read_arrow_frame(query, params=()):
+    """Run a query through ADBC, which fills Arrow columns without per-cell Python objects"""
+    # ADBC does not use the sqlite3 adapters; it binds dates as ISO text but
+    # datetimes as timestamps, so reduce those to their date like the adapters do
+    params = tuple(p.date() if isinstance(p, datetime) else p for p in params)
+    ensure_initialized()
+    conn = _checkout_arrow_connection()
     try:
-        with get_connection() as conn:
-            df = pd.read_sql("""
+        with conn.cursor() as cursor:
+            _retry_busy(cursor.execute, query, params or None)
+            table = cursor.fetch_arrow_table()
+    finally:
+        _arrow_pool.put(conn)
+    if table.num_rows == 0:
+        # Without rows the driver cannot infer column types
+        return pd.DataFrame(columns=table.column_names)
+    return table.to_pandas()
+
+def _read_frame(conn, query, params=()):
+    """
+    Build a DataFrame from a query, fetching rows in chunks so only one
+    chunk of Python row tuples is alive at a time
+    """
+    cursor = _retry_busy(conn.execute, query, params)
+    columns = [d[0] for d in cursor.description]
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(READ_CHUNK_SIZE)
+        if not rows:
+            break
+        chunks.append(pd.DataFrame.from_records(rows, columns=columns))
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+def _query_frame(query, params=()):
+    """
+    Run a read-only query into a DataFrame, through the ADBC pool when Arrow
+    fetch is enabled and through a pooled sqlite3 transaction otherwise
+    """
+    if ARROW_FETCH and DB_PATH != ":memory:":
+        try:
+            return _read_arrow_frame(query, params)
+        except Exception:
+            logger.warning("Arrow fetch failed, falling back to sqlite3", exc_info=True)
+    
+    with get_connection() as conn:
+        return _read_frame(conn, query, params)
+
+def _narrow_ints(df, columns):
+    """Cast integer columns to int32 while their values fit"""
+    if df.empty or df[columns].max().max() <= np.iinfo(np.int32).max:
+        df = df.astype(dict.fromkeys(columns, 'int32'))
+    return df
+
+def _sales_dtypes(df):
+    """
+    Give a sales frame compact dtypes: parsed dates, categorical product and
+    customer, float64 money (float32 cannot hold rupee amounts to the paisa)
+    and int32 ids and counts
+    """
+    df['order_date'] = pd.to_datetime(df['order_date'])
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    df['product'] = df['product'].astype('category')
+    df['customer'] = df['customer'].astype('category')
+    df = df.astype({'sales': 'float64', 'profit': 'float64'})
+    return _narrow_ints(df, ['id', 'quantity'])
+
+def _summary_dtypes(df):
+    """Give a get_sales_summary frame the same compact dtypes as the sales frames"""
+    df['order_date'] = pd.to_datetime(df['order_date'])
+    df['product'] = df['product'].astype('category')
+    df['customer'] = df['customer'].astype('category')
+    df = df.astype({'total_sales': 'float64', 'total_profit': 'float64'})
+    return _narrow_ints(df, ['total_quantity', 'transaction_count'])
+
+# Typed empty results returned (as shallow copies) on errors, so callers
+# always see the expected columns without a fresh frame being built each time
+_SALES_COLUMNS = ["id", "order_date", "product", "customer", "sales", "profit", "quantity", "created_at"]
+_SUMMARY_COLUMNS = ["order_date", "product", "customer", "total_sales", "total_profit",
+                    "total_quantity", "transaction_count"]
+_EMPTY_SALES_DF = _sales_dtypes(pd.DataFrame(columns=_SALES_COLUMNS))
+_EMPTY_SUMMARY_DF = _summary_dtypes(pd.DataFrame(columns=_SUMMARY_COLUMNS))
+
+def _keyset_params(before):
+    """Turn an (order_date, created_at, id) cursor back into bindable forms"""
+    order_date, created_at, record_id = before
+    if isinstance(order_date, datetime):
+        order_date = order_date.date()
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat(sep=" ", timespec="seconds")
+    return order_date, created_at, int(record_id)
+
+def get_all_sales(limit=None, before=None):
+    """Retrieve sales records, newest first
+    
+    limit caps the number of rows returned (None returns all of them).
+    before is the (order_date, created_at, id) of the last row of the
+    previous page; only rows that sort after it are returned.
+    """
+    try:
+        # SQLite treats a negative LIMIT as no limit
+        limit = -1 if limit is None else limit
+        if before is None:
+            df = _query_frame("""
                 SELECT id, order_date, product, customer, 
-                       sales, profit, quantity, created_at
-                FROM sales 
-                ORDER BY order_date DESC, created_at DESC
-            """, conn)
-            return df
-    except Exception as e:
-        print(f"Error loading sales data: {e}")
-        return pd.DataFrame()
+                       sales / 100.0 AS sales, profit / 100.0 AS profit,
+                       quantity, created_at
+                FROM sales INDEXED BY idx_sales_recent
+                ORDER BY order_date DESC, created_at DESC, id DESC
+                LIMIT ?
+            """, (limit,))
+        else:
+            df = _query_frame("""
+                SELECT id, order_date, product, customer, 
+                       sales / 100.0 AS sales, profit / 100.0 AS profit,
+                       quantity, created_at
+                FROM sales INDEXED BY idx_sales_recent
+                WHERE (order_date, created_at, id) < (?, ?, ?)
+                ORDER BY order_date DESC, created_at DESC, id DESC
+                LIMIT ?
+            """, (*_keyset_params(before), limit))
+        return _sales_dtypes(df)
+    except Exception:
+        logger.exception("Error loading sales data")
+        return _EMPTY_SALES_DF.copy(deep=False)
+
+def get_filtered_sales(start_date, end_date, product=None, min_sales=0, min_profit=0):
+    """Retrieve sales records matching the dashboard filters"""
+    try:
+        df = _query_frame("""
+            SELECT id, order_date, product, customer,
+                   sales / 100.0 AS sales, profit / 100.0 AS profit,
+                   quantity, created_at
+            FROM sales
+            WHERE order_date BETWEEN ? AND ?
+              AND (? IS NULL OR product = ?)
+              AND sales >= ?
+              AND profit >= ?
+            ORDER BY order_date DESC, created_at DESC
+        """, (
+            start_date,
+            end_date,
+            product,
+            product,
+            _to_cents(min_sales),
+            _to_cents(min_profit)
+        ))
+        return _sales_dtypes(df)
+    except Exception:
+        logger.exception("Error loading filtered sales data")
+        return _EMPTY_SALES_DF.copy(deep=False)
+
+def get_filter_metadata():
+    """
+    Get the values needed to populate dashboard filters without a full table load
+    Returns: dict with min_date, max_date and sorted list of products
+    """
+    metadata = {"min_date": None, "max_date": None, "products": []}
+    try:
+        with get_connection() as conn:
+            min_date, max_date = _retry_busy(
+                conn.execute, "SELECT MIN(order_date), MAX(order_date) FROM sales"
+            ).fetchone()
+            if min_date is not None:
+                metadata["min_date"] = pd.to_datetime(min_date).date()
+                metadata["max_date"] = pd.to_datetime(max_date).date()
+            metadata["products"] = [
+                row[0] for row in _retry_busy(
+                    conn.execute, "SELECT DISTINCT product FROM sales ORDER BY product"
+                )
+            ]
+    except Exception:
+        logger.exception("Error loading filter metadata")
+    return metadata
 
 def delete_sale_record(record_id):
     """Delete a sale record by ID"""
     try:
-        with get_connection() as conn:
-            cursor = conn.execute("DELETE FROM sales WHERE id = ?", (int(record_id),))
+        with get_connection(immediate=True) as conn:
+            cursor = _retry_busy(conn.execute, "DELETE FROM sales WHERE id = ?", (int(record_id),))
             conn.commit()
-            return cursor.rowcount > 0
-    except Exception as e:
-        print(f"Error deleting record: {e}")
+        _invalidate_caches()
+        return cursor.rowcount > 0
+    except Exception:
+        logger.exception("Error deleting record %s", record_id)
         return False
 
+def _to_cents(amount):
+    """Convert a rupee amount to the whole cents stored in the database"""
+    return int(round(float(amount) * 100))
+
+def _update_sql(columns):
+    """Build the UPDATE statement for a sorted tuple of columns once and reuse it"""
+    sql = _UPDATE_SQL_CACHE.get(columns)
+    if sql is None:
+        set_clause = ", ".join(f"{k} = ?" for k in columns)
+        sql = _UPDATE_SQL_CACHE[columns] = f"UPDATE sales SET {set_clause} WHERE id = ?"
+    return sql
+
 def update_sale_record(record_id, **updates):
-    """Update a sale record"""
+    """Update a sale record; only columns in UPDATABLE_COLUMNS can be changed"""
     try:
-        with get_connection() as conn:
-            set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-            values = list(updates.values())
-            values.append(record_id)
-            
-            conn.execute(f"""
-                UPDATE sales 
-                SET {set_clause}
-                WHERE id = ?
-            """, values)
+        unknown = updates.keys() - UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update column(s): {', '.join(sorted(unknown))}")
+        if not updates:
+            raise ValueError("No columns to update")
+        
+        for money in ("sales", "profit"):
+            if money in updates:
+                updates[money] = _to_cents(updates[money])
+        
+        # Sorted keys give a stable cache key, so the same SQL text is reused
+        # and hits sqlite3's per-connection statement cache
+        columns = tuple(sorted(updates))
+        with get_connection(immediate=True) as conn:
+            _retry_busy(conn.execute, _update_sql(columns), (*(updates[k] for k in columns), record_id))
             conn.commit()
-            return True
-    except Exception as e:
-        print(f"Error updating record: {e}")
+        _invalidate_caches()
+        return True
+    except Exception:
+        logger.exception("Error updating record %s", record_id)
         return False
 
+def _slice_daily_summary(daily, start_date, end_date):
+    """Cut the rows for [start_date, end_date] out of the all-time summary"""
+    # The index runs newest first, so the label slice goes from end to start
+    df = daily.loc[pd.Timestamp(end_date).normalize():pd.Timestamp(start_date).normalize()]
+    df = df.reset_index(drop=True)
+    df['product'] = df['product'].cat.remove_unused_categories()
+    df['customer'] = df['customer'].cat.remove_unused_categories()
+    return df
+
 def get_sales_summary(start_date=None, end_date=None):
-    """Get sales summary for analytics"""
+    """
+    Get sales summary for analytics, memoized until the next write; date ranges
+    are sliced from the all-time summary once that has been loaded
+    """
+    global _DAILY_SUMMARY
+    if not (start_date and end_date):
+        start_date = end_date = None
+    with _cache_lock:
+        key = (start_date, end_date, _CACHE_VERSION)
+        cached = _SUMMARY_CACHE.get(key)
+        if cached is not None:
+            _SUMMARY_CACHE.move_to_end(key)
+            return cached.copy()
+        daily = _DAILY_SUMMARY
+    
     try:
-        with get_connection() as conn:
-            query = """
-                SELECT 
-                    order_date,
-                    product,
-                    customer,
-                    SUM(sales) as total_sales,
-                    SUM(profit) as total_profit,
-                    SUM(quantity) as total_quantity,
-                    COUNT(*) as transaction_count
-                FROM sales
-            """
-            
-            params = []
-            if start_date and end_date:
-                query += " WHERE order_date BETWEEN ? AND ?"
-                params.extend([start_date, end_date])
-            
-            query += " GROUP BY order_date, product, customer ORDER BY order_date DESC"
-            
-            df = pd.read_sql(query, conn, params=params if params else None)
-            return df
-    except Exception as e:
-        print(f"Error getting sales summary: {e}")
-        return pd.DataFrame()
-
-# Initialize database when module is imported
-init_database()
\ No newline at end of file
+        if start_date is not None and daily is not None and daily[0] == key[2]:
+            df = _slice_daily_summary(daily[1], start_date, end_date)
+        else:
+            if start_date is None:
+                df = _query_frame(_SUMMARY_SQL_ALL)
+            else:
+                df = _query_frame(_SUMMARY_SQL_RANGE, (start_date, end_date))
+            df = _summary_dtypes(df)
+        
+        with _cache_lock:
+            # Skip storing if a write landed while the query was running
+            if key[2] == _CACHE_VERSION:
+                _SUMMARY_CACHE[key] = df
+                if len(_SUMMARY_CACHE) > SUMMARY_CACHE_SIZE:
+                    _SUMMARY_CACHE.popitem(last=False)
+                if start_date is None:
+                    _DAILY_SUMMARY = (key[2], df.set_index('order_date', drop=False))
+        return df.copy()
+    except Exception:
+        logger.exception("Error getting sales summary")
+        return _EMPTY_SUMMARY_DF.copy(deep=False)
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Export helpers shared by the Streamlit pages
+Keeps the downloadable file formats identical across pages
+"""
+import io
+import streamlit as st
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+@st.cache_data(show_spinner=False)
+def to_csv(df):
+    """Serialize data to CSV bytes with pyarrow's C++ writer, cached per unique DataFrame"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Write order dates as YYYY-MM-DD and timestamps at second precision
+    table = table.cast(pa.schema([
+        pa.field(
+            field.name,
+            pa.date32() if field.name == 'order_date'
+            else pa.timestamp('s') if pa.types.is_timestamp(field.type)
+            else field.type
+        )
+        for field in table.schema
+    ]), safe=False)
+    buffer = pa.BufferOutputStream()
+    pacsv.write_csv(table, buffer)
+    return buffer.getvalue().to_pybytes()
+
+@st.cache_data(show_spinner=False)
+def to_excel(df):
+    """Serialize data to Excel bytes, cached per unique DataFrame"""
+    buffer = io.BytesIO()
+    # order_date is written as plain dates so created_at keeps its time of day
+    df = df.assign(order_date=df['order_date'].dt.date)
+    with pd.ExcelWriter(buffer, engine='xlsxwriter', date_format='YYYY-MM-DD',
+                        datetime_format='YYYY-MM-DD HH:MM:SS') as writer:
+        df.to_excel(writer, index=False, sheet_name='Sales Data')
+    return buffer.getvalue()
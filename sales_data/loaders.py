@@ -0,0 +1,28 @@
+"""
+Cached data loaders shared by the Streamlit pages
+Both pages read the same sales table, so any write clears every loader
+through clear_caches() and no page keeps serving data another page changed
+"""
+import streamlit as st
+import database as db
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_sales():
+    """Load all sales records, cached across reruns"""
+    return db.get_all_sales()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_filter_metadata():
+    """Load date bounds and product list for the dashboard sidebar, cached across reruns"""
+    return db.get_filter_metadata()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_filtered_sales(start_date, end_date, product, min_sales, min_profit):
+    """Load sales records matching the dashboard filters, cached across reruns"""
+    return db.get_filtered_sales(start_date, end_date, product, min_sales, min_profit)
+
+def clear_caches():
+    """Drop every cached read; call after any insert, update or delete"""
+    load_sales.clear()
+    load_filter_metadata.clear()
+    load_filtered_sales.clear()
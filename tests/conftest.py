@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: the app modules import each other as top-level modules
+(streamlit runs them from sales_data/), so put that directory on sys.path
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sales_data"))
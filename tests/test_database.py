@@ -0,0 +1,191 @@
+"""
+Tests for the database module, run with Arrow fetch off and on
+"""
+import importlib
+import logging
+import sqlite3
+import time
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture(params=["0", "1"], ids=["sqlite3", "arrow"])
+def db(request, tmp_path, monkeypatch):
+    """Fresh database module on an empty file, with SALES_ARROW_FETCH set per param"""
+    if request.param == "1":
+        pytest.importorskip("adbc_driver_sqlite")
+    monkeypatch.setenv("SALES_ARROW_FETCH", request.param)
+    import database
+    database = importlib.reload(database)
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "sales_data.db"))
+    yield database
+    database.close_all_connections()
+
+
+def test_arrow_fetch_follows_env(db):
+    assert db.ARROW_FETCH == (db.adbc is not None and db.os.environ["SALES_ARROW_FETCH"] == "1")
+
+
+def test_reads_round_trip(db, caplog):
+    assert db.add_sale_records([
+        (date(2024, 1, 1), "Widget", "Acme", 1234567.89, 0.07, 3),
+        (date(2024, 1, 2), "Gadget", "Acme", 1.10, 0.07, 1),
+        (date(2024, 2, 1), "Widget", "Beta", 10, 5, 2),
+    ])[0]
+    
+    with caplog.at_level(logging.WARNING, logger="database"):
+        sales = db.get_all_sales()
+        filtered = db.get_filtered_sales(date(2024, 1, 1), date(2024, 1, 31), min_sales=1.10, min_profit=0.07)
+        summary = db.get_sales_summary(date(2024, 1, 1), date(2024, 1, 31))
+    
+    # Reads never fell back from the Arrow path
+    assert "Arrow fetch failed" not in caplog.text
+    assert bool(db._arrow_connections) == db.ARROW_FETCH
+    
+    assert sales["id"].tolist() == [3, 2, 1]
+    assert sales["sales"].tolist() == [10.0, 1.10, 1234567.89]
+    assert str(sales["sales"].dtype) == "float64"
+    assert str(sales["order_date"].dtype) == "datetime64[ns]"
+    assert str(sales["product"].dtype) == "category"
+    assert sorted(filtered["id"].tolist()) == [1, 2]
+    assert summary["total_profit"].sum() == pytest.approx(0.14)
+
+
+def test_reads_see_later_writes(db):
+    assert db.add_sale_record(date(2024, 1, 1), "Widget", "Acme", 10, 1, 1)[0]
+    assert len(db.get_all_sales()) == 1
+    assert db.add_sale_record(date(2024, 1, 2), "Widget", "Acme", 20, 2, 1)[0]
+    assert len(db.get_all_sales()) == 2
+    assert len(db.get_filtered_sales(date(2024, 1, 1), date(2024, 1, 31))) == 2
+
+
+def test_empty_results_keep_columns(db):
+    df = db.get_filtered_sales(date(2030, 1, 1), date(2030, 1, 31))
+    assert df.empty
+    assert list(df.columns) == db._SALES_COLUMNS
+
+
+def test_arrow_connections_get_pragmas(db):
+    if not db.ARROW_FETCH:
+        pytest.skip("Arrow fetch is disabled")
+    db.get_all_sales()
+    conn = db._checkout_arrow_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            assert cursor.fetchone()[0] == int(db.BUSY_TIMEOUT * 1000)
+            cursor.execute("PRAGMA foreign_keys")
+            assert cursor.fetchone()[0] == 1
+    finally:
+        db._arrow_pool.put(conn)
+
+
+def test_writes_fail_fast_while_locked(db):
+    assert db.add_sale_record(date(2024, 1, 1), "Widget", "Acme", 10, 5, 1)[0]
+    blocker = sqlite3.connect(db.DB_PATH, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        assert not db.add_sale_record(date(2024, 1, 2), "Widget", "Acme", 10, 5, 1)[0]
+        assert not db.delete_sale_record(1)
+        assert not db.update_sale_record(1, quantity=2)
+        # The short busy timeout leaves the waiting to _retry_busy
+        assert time.monotonic() - started < 5
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    assert db.update_sale_record(1, quantity=2)
+    assert db.delete_sale_record(1)
+
+
+def test_migrates_baseline_table_to_cents(db):
+    # The version 0 schema the app shipped with, money stored as DECIMAL rupees
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.executescript("""
+        CREATE TABLE sales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_date DATE NOT NULL,
+            product VARCHAR(100) NOT NULL,
+            customer VARCHAR(100) NOT NULL,
+            sales DECIMAL(10, 2) NOT NULL,
+            profit DECIMAL(10, 2) NOT NULL,
+            quantity INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT chk_profit CHECK (profit <= sales)
+        );
+        CREATE INDEX idx_order_date ON sales(order_date);
+        CREATE INDEX idx_product ON sales(product);
+        CREATE INDEX idx_customer ON sales(customer);
+    """)
+    conn.executemany(
+        "INSERT INTO sales (order_date, product, customer, sales, profit, quantity) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("2024-01-01", "Widget", "Acme", 1234.56, 0.07, 1),
+            ("2024-01-02", "Gadget", "Acme", 1.15, 0.29, 2),
+            ("2024-01-03", "Widget", "Beta", 10.1, 5.05, 3),
+        ],
+    )
+    # Leaves a gap that AUTOINCREMENT must not fill after the rebuild
+    conn.execute("DELETE FROM sales WHERE id = 3")
+    conn.commit()
+    conn.close()
+    
+    db.ensure_initialized()
+    
+    conn = sqlite3.connect(db.DB_PATH)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION == 1
+        assert conn.execute("SELECT id, sales, profit, typeof(sales) FROM sales ORDER BY id").fetchall() == [
+            (1, 123456, 7, "integer"),
+            (2, 115, 29, "integer"),
+        ]
+        indexes = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'sales'"
+        )}
+        assert indexes == {"idx_product", "idx_customer", "idx_sales_group", "idx_sales_recent"}
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'sales_v0'").fetchone() is None
+    finally:
+        conn.close()
+    
+    assert db.add_sale_record(date(2024, 1, 4), "Widget", "Acme", 10, 5, 1)[0]
+    assert db.get_all_sales()["id"].tolist() == [4, 2, 1]
+    assert db.get_all_sales()["sales"].tolist() == [10.0, 1.15, 1234.56]
+
+
+def test_update_rejects_unknown_columns(db, caplog):
+    assert db.add_sale_record(date(2024, 1, 1), "Widget", "Acme", 10, 5, 1)[0]
+    
+    with caplog.at_level(logging.ERROR, logger="database"):
+        assert not db.update_sale_record(1, **{"id": 99})
+        assert not db.update_sale_record(1, **{"product = 'x' --": "y"})
+        assert not db.update_sale_record(1)
+    assert "Cannot update column(s): id" in caplog.text
+    assert db.get_all_sales()["product"].tolist() == ["Widget"]
+    
+    assert db.update_sale_record(1, product="Gadget", sales=12.34, profit=1.05)
+    row = db.get_all_sales().iloc[0]
+    assert (row["id"], row["product"], row["sales"], row["profit"]) == (1, "Gadget", 12.34, 1.05)
+
+
+def test_keyset_pages_cover_every_row_once(db):
+    # One batch shares created_at, so ties on order_date fall through to id
+    assert db.add_sale_records([
+        (date(2024, 1, 1 + i % 3), "Widget", "Acme", 10, 5, 1) for i in range(7)
+    ])[0]
+    everything = db.get_all_sales()
+    
+    pages, before = [], None
+    while True:
+        page = db.get_all_sales(limit=3, before=before)
+        if page.empty:
+            break
+        assert len(page) <= 3
+        pages.append(page)
+        last = page.iloc[-1]
+        before = (last["order_date"], last["created_at"], last["id"])
+    
+    assert [len(page) for page in pages] == [3, 3, 1]
+    ids = [i for page in pages for i in page["id"].tolist()]
+    assert ids == everything["id"].tolist()
+    assert ids == [6, 3, 5, 2, 7, 4, 1]